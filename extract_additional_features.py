@@ -13,6 +13,18 @@ from typing import Dict, Any
 from datetime import datetime
 
 
+# Every feature returned by extract_additional_features(), in output order
+ADDITIONAL_FEATURES = (
+    "rd_wayback_count", "sd_wayback_count", "wayback_diff", "rd_has_wayback",
+    "sd_has_wayback", "rd_wayback_span_days", "rd_ssl_valid", "sd_ssl_valid",
+    "ssl_valid_diff", "https_diff", "rd_unique_asn_count", "sd_unique_asn_count",
+    "asn_overlap", "rd_status_code", "sd_status_code", "status_diff", "rd_html_len",
+    "sd_html_len", "html_len_diff", "rd_has_screenshot", "sd_has_screenshot",
+    "html_len_ratio", "same_server_type", "rd_server_envoy", "sd_server_envoy",
+    "same_asn_and_server", "is_likely_legit",
+)
+
+
 def extract_additional_features(additional: Dict[str, Any]) -> Dict[str, Any]:
     """
     Extracts comparison and differential features between root domain (rd)
@@ -29,7 +41,7 @@ def extract_additional_features(additional: Dict[str, Any]) -> Dict[str, Any]:
         Dictionary of numeric feature_name: value pairs.
     """
 
-    features = {}
+    features = dict.fromkeys(ADDITIONAL_FEATURES, 0)
 
     # -------------------------------
     # Safely extract base sub-blocks
@@ -8,6 +8,24 @@ of phishing analysis JSON files.
 
 from typing import Dict, Any
 from datetime import datetime
+import zlib
+
+
+# DNS record types with their (precomputed) feature names
+_DNS_TYPES = ("a", "aaaa", "ns", "txt", "soa", "mx", "dmarc")
+_DNS_FEATURE_KEYS = tuple((t, f"num_{t}_records", f"{t}_status_ok") for t in _DNS_TYPES)
+
+
+# Every feature returned by extract_hostinfo_features(), in output order
+HOSTINFO_FEATURES = (
+    "num_a_records", "a_status_ok", "num_aaaa_records", "aaaa_status_ok",
+    "num_ns_records", "ns_status_ok", "num_txt_records", "txt_status_ok",
+    "num_soa_records", "soa_status_ok", "num_mx_records", "mx_status_ok",
+    "num_dmarc_records", "dmarc_status_ok", "num_maxmind_records", "asn_code",
+    "asn_is_amazon", "country_code", "ssl_valid", "ssl_issuer_amazon",
+    "ssl_validity_days", "ssl_subject_count", "ssl_msg_success", "is_https",
+    "has_dns", "has_ipv6_support", "has_mail_config", "is_secure_host",
+)
 
 
 def extract_hostinfo_features(host_info: Dict[str, Any]) -> Dict[str, Any]:
@@ -25,17 +43,19 @@ def extract_hostinfo_features(host_info: Dict[str, Any]) -> Dict[str, Any]:
         Dictionary mapping feature names to numeric values.
     """
 
-    features = {}
+    features = dict.fromkeys(HOSTINFO_FEATURES, 0)
 
     # -------------------------------
     # 1 DNS record counts
     # -------------------------------
-    dns_types = ["a", "aaaa", "ns", "txt", "soa", "mx", "dmarc"]
-    for dns_type in dns_types:
-        answers = host_info.get(dns_type, {}).get("answers", [])
-        features[f"num_{dns_type}_records"] = len(answers)
-        status = host_info.get(dns_type, {}).get("status", "")
-        features[f"{dns_type}_status_ok"] = int(status == "NOERROR")
+    num_dns_records = 0
+    for dns_type, records_key, status_key in _DNS_FEATURE_KEYS:
+        record = host_info.get(dns_type, {})
+        answers = record.get("answers", [])
+        features[records_key] = len(answers)
+        num_dns_records += len(answers)
+        status = record.get("status", "")
+        features[status_key] = int(status == "NOERROR")
 
     # -------------------------------
     #  MaxMind (geolocation & ASN)
@@ -48,7 +68,8 @@ def extract_hostinfo_features(host_info: Dict[str, Any]) -> Dict[str, Any]:
         first_ans = maxmind_list[0].get("answers", {})
         features["asn_code"] = int(first_ans.get("asn_code", 0))
         features["asn_is_amazon"] = int("amazon" in first_ans.get("asn_org", "").lower())
-        features["country_code"] = hash(first_ans.get("cc_code", "")) % 1000  # encoded numeric
+        # encoded numeric (crc32 is stable across processes, unlike salted str hash())
+        features["country_code"] = zlib.crc32(first_ans.get("cc_code", "").encode()) % 1000
     else:
         features["asn_code"] = 0
         features["asn_is_amazon"] = 0
@@ -80,7 +101,7 @@ def extract_hostinfo_features(host_info: Dict[str, Any]) -> Dict[str, Any]:
     # -------------------------------
     #  Derived indicators
     # -------------------------------
-    features["has_dns"] = int(sum(features[f"num_{t}_records"] for t in dns_types) > 0)
+    features["has_dns"] = int(num_dns_records > 0)
     features["has_ipv6_support"] = int(features["num_aaaa_records"] > 0)
     features["has_mail_config"] = int(features["num_mx_records"] > 0)
     features["is_secure_host"] = int(features["ssl_valid"] and features["is_https"])
@@ -4,17 +4,35 @@ Author: Chayma Sadiki (adapté)
 """
 
 import os
+import csv
 import json
+import shelve
+import shutil
+import hashlib
+import inspect
 import pandas as pd
 import traceback
+from concurrent.futures import ProcessPoolExecutor
 from tqdm import tqdm
 
+try:
+    import orjson  # optional, much faster parser for large HAR blobs
+except ImportError:
+    orjson = None
+
 # --------------------------------------------------
 # Global paths (use forward slashes under Windows)
 # --------------------------------------------------
 BENIGN_PATH = "D:/Downloads/benign"
 MALICIOUS_PATH = "D:/Downloads/malicious"
 
+# Number of files handed to a worker process at once (amortizes IPC)
+POOL_CHUNKSIZE = 64
+
+# On-disk cache of extracted rows, reused across runs for unchanged files
+# (delete the ".cache" folder to force a full re-extraction)
+CACHE_DIR = ".cache/features"
+
 # --------------------------------------------------
 # Import feature extractor modules (assumed to expose functions)
 # - extract_general_features(data: dict) -> dict
@@ -22,10 +40,18 @@ MALICIOUS_PATH = "D:/Downloads/malicious"
 # - extract_contentinfo_features(content_info: dict) -> dict
 # - extract_additional_features(additional: dict) -> dict
 # --------------------------------------------------
-from extract_general_features import extract_general_features
-from extract_hostinfo_features import extract_hostinfo_features
-from extract_contentinfo_features import extract_contentinfo_features
-from extract_additional_features import extract_additional_features
+from extract_general_features import extract_general_features, GENERAL_FEATURES
+from extract_hostinfo_features import extract_hostinfo_features, HOSTINFO_FEATURES
+from extract_contentinfo_features import extract_contentinfo_features, CONTENTINFO_FEATURES
+from extract_additional_features import extract_additional_features, ADDITIONAL_FEATURES
+
+# Full dataset schema, known upfront. Names shared by several extractors
+# (e.g. url_length) keep their first position and the last extractor's value.
+FEATURE_COLUMNS = tuple(
+    dict.fromkeys(GENERAL_FEATURES + HOSTINFO_FEATURES + CONTENTINFO_FEATURES + ADDITIONAL_FEATURES)
+)
+METADATA_COLUMNS = ("label", "filename", "category")
+DATASET_COLUMNS = FEATURE_COLUMNS + METADATA_COLUMNS
 
 
 def safe_call(func, arg, fname, filename):
@@ -49,85 +75,198 @@ def safe_call(func, arg, fname, filename):
         return {}
 
 
+# Returned instead of a row when a file could not be read (I/O error, ...).
+# Unlike empty/invalid JSON, this may be transient: such files are never cached.
+_READ_ERROR = "__read_error__"
+
+
 def load_json_file(file_path, filename):
-    """Robust JSON loader returning dict or None (and prints errors)."""
+    """
+    Robust JSON loader (prints errors). Returns the parsed JSON, None if the
+    file is empty or not valid JSON, or _READ_ERROR if it could not be read.
+    """
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read().strip()
-            if not content:
-                print(f"Empty file skipped: {filename}")
-                return None
-            return json.loads(content)
-    except json.JSONDecodeError as e:
+        with open(file_path, "rb") as f:
+            content = f.read()
+        if not content or content.isspace():
+            print(f"Empty file skipped: {filename}")
+            return None
+        if orjson is not None:
+            try:
+                return orjson.loads(content)
+            except orjson.JSONDecodeError:
+                # orjson is stricter (NaN, huge ints): let json decide
+                pass
+        return json.loads(content)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
         print(f"Invalid JSON in '{filename}': {e}")
         return None
     except Exception as e:
         print(f"Error reading '{filename}': {e}")
         traceback.print_exc()
+        return _READ_ERROR
+
+
+def _process_one(task):
+    """
+    Load one JSON file and run every extractor on it (executed in a worker process).
+    task = (file_path, label, category_name, filename).
+    Returns the row as a tuple of values in DATASET_COLUMNS order (no per-row
+    keys to pickle back to the parent or store in the cache), None if the
+    file was skipped for its content, or _READ_ERROR if it could not be read.
+    """
+    file_path, label, category_name, filename = task
+    data = load_json_file(file_path, filename)
+    if data == _READ_ERROR:
+        return _READ_ERROR
+    if not data:
+        # Already logged the reason in load_json_file
         return None
+    if not isinstance(data, dict):
+        print(f"Skipped invalid JSON structure in: {filename}")
+        return None
+
+    # Collect features safely: one extractor failure won't drop the whole file
+    # (its features stay at 0)
+    row = dict.fromkeys(FEATURE_COLUMNS, 0)
+
+    # general features (pass entire top-level JSON)
+    row.update(safe_call(extract_general_features, data, "extract_general_features", filename))
+
+    # host_info, content_info, additional may be nested or absent; pass {} if missing
+    host_info = data.get("host_info") or {}
+    content_info = data.get("content_info") or {}
+    additional = data.get("additional") or {}
 
+    row.update(safe_call(extract_hostinfo_features, host_info, "extract_hostinfo_features", filename))
+    row.update(safe_call(extract_contentinfo_features, content_info, "extract_contentinfo_features", filename))
+    row.update(safe_call(extract_additional_features, additional, "extract_additional_features", filename))
 
-def build_global_dataframe() -> pd.DataFrame:
-    data_rows = []
+    # metadata
+    row["label"] = label
+    row["filename"] = filename
+    row["category"] = category_name
 
+    return tuple(row[name] for name in DATASET_COLUMNS)
+
+
+def _cache_key(entry):
+    """
+    Cache key of a JSON file (os.DirEntry): absolute path, size and modification time.
+    Returns None if the file can't be stat'ed (it is then extracted without caching,
+    and load_json_file reports the problem).
+    """
+    try:
+        st = entry.stat()
+    except OSError:
+        return None
+    return f"{os.path.abspath(entry.path)}|{st.st_size}|{st.st_mtime_ns}"
+
+
+def _extractors_fingerprint():
+    """Hash of the extraction code: the cache is discarded when any of it changes."""
+    digest = hashlib.sha1()
+    for func in (
+        _process_one,
+        extract_general_features,
+        extract_hostinfo_features,
+        extract_contentinfo_features,
+        extract_additional_features,
+    ):
+        with open(inspect.getsourcefile(func), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def build_global_dataset(out_path) -> int:
+    """
+    Extract every benign/malicious JSON file and stream the rows to a CSV file
+    at out_path as they are produced (memory stays flat whatever the corpus size).
+    Rows go to out_path + ".tmp", which replaces out_path only once every file
+    has been processed: an interrupted run leaves the previous dataset intact.
+    Returns the number of rows written.
+    """
     categories = [
         (BENIGN_PATH, 1, "benign"),
         (MALICIOUS_PATH, 0, "malicious"),
     ]
+    n_rows = 0
+    n_skipped = 0
+    tmp_path = out_path + ".tmp"
 
-    for folder_path, label, category_name in categories:
-        if not os.path.exists(folder_path):
-            print(f"Folder not found: {folder_path}")
-            continue
+    # The cache is rebuilt from scratch on every run: hits are copied from the
+    # previous shelf, so entries of deleted/modified files don't pile up.
+    # The new shelf only replaces the old one once the run has completed.
+    new_cache_dir = CACHE_DIR + ".new"
+    shutil.rmtree(new_cache_dir, ignore_errors=True)
+    os.makedirs(new_cache_dir)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    fingerprint = _extractors_fingerprint()
 
-        print(f"\n Processing folder: {category_name.upper()} — label={label}")
+    # Files are independent: extract them in parallel, one process per core
+    with open(tmp_path, "w", newline="", encoding="utf-8") as out_file, \
+            shelve.open(os.path.join(CACHE_DIR, "rows")) as old_cache, \
+            shelve.open(os.path.join(new_cache_dir, "rows"), flag="n") as cache, \
+            ProcessPoolExecutor() as executor:
+        writer = csv.writer(out_file, lineterminator="\n")
+        writer.writerow(DATASET_COLUMNS)
 
-        files = [fn for fn in os.listdir(folder_path) if fn.lower().endswith(".json")]
-        for filename in tqdm(files, desc=f"{category_name} files", unit="file"):
-            file_path = os.path.join(folder_path, filename)
-            data = load_json_file(file_path, filename)
-            if not data:
-                # Already logged the reason in load_json_file
-                continue
-            if not isinstance(data, dict):
-                print(f"Skipped invalid JSON structure in: {filename}")
-                continue
+        cache["__fingerprint__"] = fingerprint
+        reuse_cache = old_cache.get("__fingerprint__") == fingerprint
 
-            # Collect features safely: one extractor failure won't drop the whole file
-            row = {}
+        for folder_path, label, category_name in categories:
+            if not os.path.exists(folder_path):
+                print(f"Folder not found: {folder_path}")
+                continue
 
-            # general features (pass entire top-level JSON)
-            row.update(safe_call(extract_general_features, data, "extract_general_features", filename))
+            print(f"\n Processing folder: {category_name.upper()} — label={label}")
 
-            # host_info, content_info, additional may be nested or absent; pass {} if missing
-            host_info = data.get("host_info") or {}
-            content_info = data.get("content_info") or {}
-            additional = data.get("additional") or {}
+            # scandir entries carry the file type (and stat on Windows) from the directory listing
+            with os.scandir(folder_path) as it:
+                entries = [e for e in it if e.name.lower().endswith(".json") and e.is_file()]
+            tasks = [(e.path, label, category_name, e.name) for e in entries]
+            keys = [_cache_key(e) for e in entries]
 
-            row.update(safe_call(extract_hostinfo_features, host_info, "extract_hostinfo_features", filename))
-            row.update(safe_call(extract_contentinfo_features, content_info, "extract_contentinfo_features", filename))
-            row.update(safe_call(extract_additional_features, additional, "extract_additional_features", filename))
+            # Only files without a cached row are sent to the workers;
+            # map() yields results in file order so the CSV is reproducible
+            cached = [reuse_cache and key is not None and key in old_cache for key in keys]
+            misses = [task for task, hit in zip(tasks, cached) if not hit]
+            computed = executor.map(_process_one, misses, chunksize=POOL_CHUNKSIZE)
 
-            # metadata
-            row["label"] = label
-            row["filename"] = filename
-            row["category"] = category_name
+            for task, key, hit in tqdm(
+                zip(tasks, keys, cached), total=len(tasks), desc=f"{category_name} files", unit="file"
+            ):
+                row = old_cache[key] if hit else next(computed)
+                if row == _READ_ERROR:
+                    # Already logged by load_json_file; retried on the next run
+                    n_skipped += 1
+                    continue
+                # skipped files (empty / invalid JSON) are cached as None
+                # so that they are not re-read on the next run
+                if key is not None:
+                    cache[key] = row
+                if row is None:
+                    if hit:
+                        print(f"Skipped (cached, empty or invalid JSON): {task[3]}")
+                    n_skipped += 1
+                    continue
+                writer.writerow(row)
+                n_rows += 1
 
-            data_rows.append(row)
+    os.replace(tmp_path, out_path)
+    shutil.rmtree(CACHE_DIR)
+    os.replace(new_cache_dir, CACHE_DIR)
 
-    df = pd.DataFrame(data_rows)
-    # Optionally fill NaNs with 0 or other value:
-    if not df.empty:
-        df.fillna(0, inplace=True)
-    print(f"\n Dataset built with {len(df)} samples and {len(df.columns)} columns.")
-    return df
+    print(f"\n Dataset built with {n_rows} samples and {len(DATASET_COLUMNS)} columns.")
+    if n_skipped:
+        print(f" {n_skipped} file(s) skipped (see messages above).")
+    return n_rows
 
 
 if __name__ == "__main__":
-    df = build_global_dataframe()
     os.makedirs("output", exist_ok=True)
     out = os.path.join("output", "phishing_dataset.csv")
-    df.to_csv(out, index=False, encoding="utf-8")
+    build_global_dataset(out)
     print(f"\n CSV saved to: {out}")
     print("\n DataFrame preview:")
-    print(df.head(5))
+    print(pd.read_csv(out, nrows=5))